@@ -1,8 +1,11 @@
+import base64
+
 import streamlit as st
-import sqlite3
+import numpy as np
 import pandas as pd
-import random
-from datetime import datetime
+
+from data import (JOB_TYPE_ORDER, PLAYER_BUCKETS, count_jobs, fetch_image,
+                  get_description, load_filter_options, load_jobs)
 
 # Page config
 st.set_page_config(
@@ -85,78 +88,15 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Custom job type order
-JOB_TYPE_ORDER = [
-    "GP and Street", "Race", "Stunt Race", "Banger Race", "Off Road",
-    "Deathmatch", "King of the Hill", "Last Team Standing", "Parkour", "Other"
-]
-
-# Database connection
-@st.cache_resource
-def get_connection():
-    return sqlite3.connect('rockstar_jobs.db', check_same_thread=False)
-
-# Load data with caching
-@st.cache_data(ttl=300)
-def load_jobs():
-    conn = get_connection()
-    query = """
-    SELECT 
-        id,
-        job_name,
-        job_creator,
-        job_type_edited,
-        max_players,
-        verification_type,
-        creation_date,
-        last_updated,
-        scraped_at,
-        gta_lens_link,
-        original_url,
-        job_description,
-        job_image
-    FROM jobs
-    """
-    df = pd.read_sql_query(query, conn)
-    return df
-
-# Parse date string to datetime
-def parse_date(date_str):
-    if pd.isna(date_str):
-        return None
-    try:
-        # Parse "August 08, 2015" format
-        return datetime.strptime(date_str, "%B %d, %Y")
-    except:
-        return None
-
-# Format date for display
-def format_date(date_str):
-    dt = parse_date(date_str)
-    if dt:
-        return dt.strftime("%b %d, %Y")
-    return date_str
-
-# Extract year from date string
-def extract_year(date_str):
-    if pd.isna(date_str):
-        return None
-    try:
-        parts = date_str.split(',')
-        if len(parts) >= 2:
-            return int(parts[1].strip())
-    except:
-        return None
-    return None
-
-# Parse scraped_at datetime
-def parse_scraped_at(scraped_str):
-    if pd.isna(scraped_str):
-        return None
-    try:
-        return datetime.strptime(scraped_str, "%Y-%m-%d %H:%M:%S")
-    except:
-        return None
+# Card view sort options mapped to their backing columns
+SORT_COLUMNS = {
+    "Job Name": 'job_name',
+    "Job Creator": 'job_creator',
+    "Job Type": 'job_type_edited',
+    "Creation Date": 'creation_date_dt',
+    "Last Updated": 'last_updated_dt',
+    "Scraped At": 'scraped_at_dt'
+}
 
 # Sort job types by custom order
 def sort_job_types(job_types):
@@ -171,24 +111,6 @@ def sort_job_types(job_types):
             sorted_types.append(jt)
     return sorted_types
 
-# Get all unique verification types from the dataframe
-def get_all_verification_types(df):
-    """Extract all unique verification types from comma-separated values"""
-    all_verifications = set()
-    for verif in df['verification_type'].dropna():
-        # Split by comma and strip whitespace
-        types = [v.strip() for v in str(verif).split(',')]
-        all_verifications.update(types)
-    return sorted(list(all_verifications))
-
-# Check if job has a specific verification type
-def has_verification_type(verification_str, target_type):
-    """Check if a verification string contains a specific type"""
-    if pd.isna(verification_str):
-        return False
-    verifications = [v.strip() for v in str(verification_str).split(',')]
-    return target_type in verifications
-
 # Create verification badges HTML
 def create_verification_badges(verification_str):
     """Create HTML for multiple verification badges"""
@@ -197,37 +119,31 @@ def create_verification_badges(verification_str):
     verifications = [v.strip() for v in str(verification_str).split(',')]
     return ''.join([f'<span class="badge badge-green">{v}</span>' for v in verifications])
 
-# Initialize session state
-if 'expanded_cards' not in st.session_state:
-    st.session_state.expanded_cards = set()
-if 'selected_job_types' not in st.session_state:
-    st.session_state.selected_job_types = []
-if 'selected_max_players' not in st.session_state:
-    st.session_state.selected_max_players = []
-if 'selected_verifications' not in st.session_state:
-    st.session_state.selected_verifications = []
-if 'search_term' not in st.session_state:
-    st.session_state.search_term = ""
-
-# Load data
-df = load_jobs()
-
-# Add parsed date columns for sorting
-df['creation_date_dt'] = df['creation_date'].apply(parse_date)
-df['last_updated_dt'] = df['last_updated'].apply(parse_date)
-df['scraped_at_dt'] = df['scraped_at'].apply(parse_scraped_at)
-df['creation_year'] = df['creation_date'].apply(extract_year)
-df['update_year'] = df['last_updated'].apply(extract_year)
-
-# Add job type order for sorting
-job_type_order_map = {jt: idx for idx, jt in enumerate(JOB_TYPE_ORDER)}
-df['job_type_order'] = df['job_type_edited'].map(lambda x: job_type_order_map.get(x, 999))
-
-# Get min/max years for sliders from full dataset
-min_creation_year_full = int(df['creation_year'].min()) if df['creation_year'].notna().any() else 2013
-max_creation_year_full = int(df['creation_year'].max()) if df['creation_year'].notna().any() else 2025
-min_update_year_full = int(df['update_year'].min()) if df['update_year'].notna().any() else 2013
-max_update_year_full = int(df['update_year'].max()) if df['update_year'].notna().any() else 2025
+# Reset every filter widget to its default; runs as a button callback
+def clear_filters():
+    st.session_state.job_types_filter = []
+    st.session_state.verifications_filter = []
+    st.session_state.max_players_filter = []
+    st.session_state.search_input = ""
+    # Reset sliders to their default ranges
+    st.session_state.pop('creation_slider', None)
+    st.session_state.pop('update_slider', None)
+
+# Pagination callbacks; as widget callbacks inside the card fragment they
+# trigger fragment-scoped reruns only
+def go_prev_page():
+    st.session_state.current_page -= 1
+
+def go_next_page():
+    st.session_state.current_page += 1
+
+# Load filter options and slider bounds from the full table
+filter_options = load_filter_options()
+total_jobs_count = filter_options['total_jobs']
+min_creation_year_full = filter_options['min_creation_year']
+max_creation_year_full = filter_options['max_creation_year']
+min_update_year_full = filter_options['min_update_year']
+max_update_year_full = filter_options['max_update_year']
 
 # Title with image
 col_title_img, col_title_text = st.columns([1, 20])
@@ -239,175 +155,83 @@ with col_title_text:
 # Tabs
 tab1, tab2, tab3 = st.tabs(["📇 Card View", "📊 Table View", "🎲 Random Jobs"])
 
-# Sidebar for filters
+# Sidebar for filters. One form batches any number of filter edits into a
+# single rerun on Apply, instead of a rerun per widget interaction
 with st.sidebar:
     st.header("🔍 Search & Filters")
-    
-    # Search with strip() applied
-    search_input = st.text_input("Search", placeholder="Job name, creator...", value=st.session_state.search_term, key="search_input")
-    search_term = search_input.strip()  # Strip whitespace
-    
-    st.divider()
-    
-    # Job Type Filter with buttons in custom order
-    st.subheader("Job Types")
-    job_types = list(df['job_type_edited'].unique())
-    job_types_sorted = sort_job_types(job_types)
-    
-    # Create columns for job type buttons
-    num_cols = 2
-    cols = st.columns(num_cols)
-    for idx, job_type in enumerate(job_types_sorted):
-        with cols[idx % num_cols]:
-            is_selected = job_type in st.session_state.selected_job_types
-            button_type = "primary" if is_selected else "secondary"
-            if st.button(job_type, key=f"jt_{job_type}", type=button_type):
-                if is_selected:
-                    st.session_state.selected_job_types.remove(job_type)
-                else:
-                    st.session_state.selected_job_types.append(job_type)
-                st.rerun()
-    
-    st.divider()
-    
-    # Verification Type Filter
-    st.subheader("Verification Types")
-    verification_types = get_all_verification_types(df)
-    
-    # Create columns for verification buttons (2 columns)
-    num_cols = 2
-    cols = st.columns(num_cols)
-    for idx, verif_type in enumerate(verification_types):
-        with cols[idx % num_cols]:
-            is_selected = verif_type in st.session_state.selected_verifications
-            button_type = "primary" if is_selected else "secondary"
-            if st.button(verif_type, key=f"vt_{verif_type}", type=button_type):
-                if is_selected:
-                    st.session_state.selected_verifications.remove(verif_type)
-                else:
-                    st.session_state.selected_verifications.append(verif_type)
-                st.rerun()
-    
-    st.divider()
-    
-    # Max Players Filter with buttons
-    st.subheader("Max Players")
-    player_ranges = [("30", "30"), ("16-29", "16-29"), ("8-15", "8-15")]
-    
-    cols = st.columns(3)
-    for idx, (label, value) in enumerate(player_ranges):
-        with cols[idx]:
-            is_selected = value in st.session_state.selected_max_players
-            button_type = "primary" if is_selected else "secondary"
-            if st.button(label, key=f"mp_{value}", type=button_type):
-                if is_selected:
-                    st.session_state.selected_max_players.remove(value)
-                else:
-                    st.session_state.selected_max_players.append(value)
-                st.rerun()
-    
-    st.divider()
-    
-    # Creation Year Filter
-    st.subheader("Creation Year")
-    creation_year_range = st.slider(
-        "Select range",
-        min_value=min_creation_year_full,
-        max_value=max_creation_year_full,
-        value=(min_creation_year_full, max_creation_year_full),
-        key="creation_slider"
-    )
-    
-    st.divider()
-    
-    # Update Year Filter
-    st.subheader("Last Updated Year")
-    update_year_range = st.slider(
-        "Select range",
-        min_value=min_update_year_full,
-        max_value=max_update_year_full,
-        value=(min_update_year_full, max_update_year_full),
-        key="update_slider"
-    )
-    
-    st.divider()
-    
+
+    with st.form("filters", border=False):
+        # Search with strip() applied
+        search_input = st.text_input("Search", placeholder="Job name, creator...", key="search_input")
+
+        st.divider()
+
+        selected_job_types = st.multiselect(
+            "Job Types",
+            sort_job_types(filter_options['job_types']),
+            key="job_types_filter"
+        )
+
+        selected_verifications = st.multiselect(
+            "Verification Types",
+            filter_options['verification_types'],
+            key="verifications_filter"
+        )
+
+        selected_max_players = st.multiselect(
+            "Max Players",
+            list(PLAYER_BUCKETS),
+            key="max_players_filter"
+        )
+
+        st.divider()
+
+        creation_year_range = st.slider(
+            "Creation Year",
+            min_value=min_creation_year_full,
+            max_value=max_creation_year_full,
+            value=(min_creation_year_full, max_creation_year_full),
+            key="creation_slider"
+        )
+
+        update_year_range = st.slider(
+            "Last Updated Year",
+            min_value=min_update_year_full,
+            max_value=max_update_year_full,
+            value=(min_update_year_full, max_update_year_full),
+            key="update_slider"
+        )
+
+        st.form_submit_button("Apply Filters", type="primary")
+
     # Clear filters button
-    if st.button("Clear All Filters"):
-        st.session_state.selected_job_types = []
-        st.session_state.selected_max_players = []
-        st.session_state.selected_verifications = []
-        st.session_state.search_term = ""
-        # Reset sliders by forcing a rerun with default values
-        if 'creation_slider' in st.session_state:
-            del st.session_state['creation_slider']
-        if 'update_slider' in st.session_state:
-            del st.session_state['update_slider']
-        st.rerun()
-
-# Apply filters
-filtered_df = df.copy()
-
-# Search filter
-if search_term:
-    search_lower = search_term.lower()
-    filtered_df = filtered_df[
-        filtered_df['job_name'].str.lower().str.contains(search_lower, na=False) |
-        filtered_df['job_creator'].str.lower().str.contains(search_lower, na=False) |
-        filtered_df['job_description'].str.lower().str.contains(search_lower, na=False)
-    ]
-
-# Job type filter
-if st.session_state.selected_job_types:
-    filtered_df = filtered_df[filtered_df['job_type_edited'].isin(st.session_state.selected_job_types)]
-
-# Verification type filter
-if st.session_state.selected_verifications:
-    # Filter jobs that have ANY of the selected verification types
-    mask = filtered_df['verification_type'].apply(
-        lambda x: any(has_verification_type(x, vt) for vt in st.session_state.selected_verifications)
-    )
-    filtered_df = filtered_df[mask]
-
-# Max players filter
-if st.session_state.selected_max_players:
-    def check_max_players(players, filters):
-        try:
-            p = int(players)
-            for f in filters:
-                if f == "30" and p == 30:
-                    return True
-                elif f == "16-29" and 16 <= p <= 29:
-                    return True
-                elif f == "8-15" and 8 <= p <= 15:
-                    return True
-            return False
-        except:
-            return False
-    
-    filtered_df = filtered_df[
-        filtered_df['max_players'].apply(lambda x: check_max_players(x, st.session_state.selected_max_players))
-    ]
-
-# Creation year filter
-filtered_df = filtered_df[
-    (filtered_df['creation_year'] >= creation_year_range[0]) &
-    (filtered_df['creation_year'] <= creation_year_range[1])
-]
-
-# Update year filter
-filtered_df = filtered_df[
-    (filtered_df['update_year'] >= update_year_range[0]) &
-    (filtered_df['update_year'] <= update_year_range[1])
-]
-
-# Card View
-with tab1:
+    st.button("Clear All Filters", on_click=clear_filters)
+
+search_term = search_input.strip()  # Strip whitespace
+
+# The active filters as one tuple, shared by the row, page and count queries
+filter_args = (
+    search_term,
+    tuple(selected_job_types),
+    tuple(selected_max_players),
+    tuple(selected_verifications),
+    creation_year_range,
+    update_year_range
+)
+
+# Full filtered frame for the table and random views; the card view pages
+# through SQL and never materializes more than one page
+filtered_df = load_jobs(*filter_args)
+
+# Card View. A fragment, so sort and page interactions rerun only this
+# subtree instead of re-executing the whole script
+@st.fragment
+def render_card_view(filter_args):
     col_sort1, col_sort2, col_count = st.columns([2, 1, 1])
     with col_sort1:
         sort_by = st.selectbox(
             "Sort by",
-            ["Job Name", "Job Creator", "Job Type", "Creation Date", "Last Updated", "Scraped At"],
+            list(SORT_COLUMNS),
             index=5,  # Default to "Scraped At" (index 5 in the list)
             key="card_sort"
         )
@@ -418,35 +242,19 @@ with tab1:
             index=1,  # Default to "Descending" (index 1 in the list)
             key="card_order"
         )
+    # Count query with the same WHERE clause powers the paginator
+    total_filtered = count_jobs(*filter_args)
     with col_count:
-        st.markdown(f"**{len(filtered_df)} of {len(df)}**")
-    
-    # Apply sorting
-    sorted_df = filtered_df.copy()
-    ascending = (sort_order == "Ascending")
-    
-    if sort_by == "Job Name":
-        sorted_df = sorted_df.sort_values('job_name', ascending=ascending)
-    elif sort_by == "Job Creator":
-        sorted_df = sorted_df.sort_values('job_creator', ascending=ascending)
-    elif sort_by == "Job Type":
-        sorted_df = sorted_df.sort_values('job_type_order', ascending=ascending)
-    elif sort_by == "Creation Date":
-        sorted_df = sorted_df.sort_values('creation_date_dt', ascending=ascending, na_position='last')
-    elif sort_by == "Last Updated":
-        sorted_df = sorted_df.sort_values('last_updated_dt', ascending=ascending, na_position='last')
-    elif sort_by == "Scraped At":
-        sorted_df = sorted_df.sort_values('scraped_at_dt', ascending=ascending, na_position='last')
-    
+        st.markdown(f"**{total_filtered} of {total_jobs_count}**")
+
     st.divider()
-    
-    if len(sorted_df) == 0:
+
+    if total_filtered == 0:
         st.info("No jobs found matching your filters.")
     else:
         # Pagination
         jobs_per_page = 30
-        total_jobs = len(sorted_df)
-        total_pages = (total_jobs + jobs_per_page - 1) // jobs_per_page  # Ceiling division
+        total_pages = (total_filtered + jobs_per_page - 1) // jobs_per_page  # Ceiling division
         
         # Initialize page number in session state
         if 'current_page' not in st.session_state:
@@ -460,105 +268,94 @@ with tab1:
         col_prev, col_page_info, col_next = st.columns([1, 2, 1])
         
         with col_prev:
-            if st.button("← Previous", disabled=(st.session_state.current_page <= 1)):
-                st.session_state.current_page -= 1
-                st.rerun()
-        
+            st.button("← Previous", disabled=(st.session_state.current_page <= 1),
+                      on_click=go_prev_page)
+
         with col_page_info:
             st.markdown(f"<div style='text-align: center; padding: 0.5rem;'>Page {st.session_state.current_page} of {total_pages}</div>", unsafe_allow_html=True)
-        
+
         with col_next:
-            if st.button("Next →", disabled=(st.session_state.current_page >= total_pages)):
-                st.session_state.current_page += 1
-                st.rerun()
+            st.button("Next →", disabled=(st.session_state.current_page >= total_pages),
+                      on_click=go_next_page)
         
         st.divider()
         
-        # Calculate start and end indices for current page
-        start_idx = (st.session_state.current_page - 1) * jobs_per_page
-        end_idx = min(start_idx + jobs_per_page, total_jobs)
-        
-        # Display only jobs for current page
-        page_df = sorted_df.iloc[start_idx:end_idx]
+        # Fetch only the current page, sorted and sliced in SQL
+        page_df = load_jobs(
+            *filter_args,
+            sort_key=SORT_COLUMNS[sort_by],
+            ascending=(sort_order == "Ascending"),
+            limit=jobs_per_page,
+            offset=(st.session_state.current_page - 1) * jobs_per_page
+        )
         
-        for _, job in page_df.iterrows():
-            col1, col2 = st.columns([1, 4])
-            
-            with col1:
-                if pd.notna(job['job_image']):
-                    try:
-                        st.image(job['job_image'], width='stretch')
-                    except:
-                        st.write("🖼️")
-            
-            with col2:
-                # Job title and creator on one line
-                max_players_text = f" ({job['max_players']} players)" if str(job['max_players']) != "30" else ""
-                st.markdown(f"### [{job['job_name']}]({job['original_url']}) by {job['job_creator']}{max_players_text}")
-                
-                # Creation date on second line
-                st.markdown(f"*Created: {format_date(job['creation_date'])}*")
-                
-                # Badges with multiple verification types
-                verification_badges = create_verification_badges(job['verification_type'])
-                badge_html = f"""
-                <div style="margin: 0.5rem 0;">
-                    <span class="badge badge-blue">{job['job_type_edited']}</span>
-                    {verification_badges}
+        # Null checks vectorized once per page instead of dispatched
+        # through pd.notna per row inside the loop
+        has_image = page_df['job_image'].notna().to_numpy()
+        has_lens = page_df['gta_lens_link'].notna().to_numpy()
+        full_lobby = page_df['max_players_int'].eq(30).fillna(False).to_numpy()
+
+        # The whole page renders as one HTML payload instead of ~10 widget
+        # calls per card. Thumbnails are inlined as data URIs; full-size
+        # fallbacks stay as URLs so the browser fetches and caches them.
+        # Descriptions use native <details>, which drops the per-card
+        # toggle button and its session state
+        cards = []
+        for i, job in enumerate(page_df.itertuples(index=False)):
+            if job.job_thumb is not None:
+                thumb_b64 = base64.b64encode(job.job_thumb).decode()
+                img_html = f'<img src="data:image/jpeg;base64,{thumb_b64}" style="width: 100%; border-radius: 0.25rem;">'
+            elif has_image[i]:
+                img_html = f'<img src="{job.job_image}" style="width: 100%; border-radius: 0.25rem;" loading="lazy">'
+            else:
+                img_html = ""
+            max_players_text = "" if full_lobby[i] else f" ({job.max_players} players)"
+            verification_badges = create_verification_badges(job.verification_type)
+            lens_html = f'<p>🔗 <a href="{job.gta_lens_link}" target="_blank">GTALens Link</a></p>' if has_lens[i] else ""
+            # Description text is still only fetched for rows that have one
+            desc_html = f'<details><summary>📄 Description</summary><p>{get_description(job.id)}</p></details>' if job.has_description else ""
+            cards.append(f"""
+            <div class="job-card" style="display: flex; gap: 1rem;">
+                <div style="flex: 0 0 120px;">{img_html}</div>
+                <div style="flex: 1;">
+                    <h3 style="margin-top: 0;"><a href="{job.original_url}" target="_blank">{job.job_name}</a> by {job.job_creator}{max_players_text}</h3>
+                    <p><em>Created: {job.creation_date_display}</em></p>
+                    <div style="margin: 0.5rem 0;">
+                        <span class="badge badge-blue">{job.job_type_edited}</span>
+                        {verification_badges}
+                    </div>
+                    {lens_html}
+                    {desc_html}
                 </div>
-                """
-                st.markdown(badge_html, unsafe_allow_html=True)
-                
-                # GTALens link
-                if pd.notna(job['gta_lens_link']):
-                    st.markdown(f"🔗 [GTALens Link]({job['gta_lens_link']})")
-                
-                # Collapsible description
-                if pd.notna(job['job_description']) and job['job_description']:
-                    card_id = f"card_{job['id']}"
-                    if st.button("📄 Description", key=f"btn_{job['id']}"):
-                        if card_id in st.session_state.expanded_cards:
-                            st.session_state.expanded_cards.remove(card_id)
-                        else:
-                            st.session_state.expanded_cards.add(card_id)
-                    
-                    if card_id in st.session_state.expanded_cards:
-                        st.info(job['job_description'])
-            
-            st.divider()
+            </div>
+            """)
+        st.markdown(''.join(cards), unsafe_allow_html=True)
+
+with tab1:
+    render_card_view(filter_args)
 
 # Table View
 with tab2:
-    st.markdown(f"**Showing {len(filtered_df)} of {len(df)} jobs**")
+    st.markdown(f"**Showing {len(filtered_df)} of {total_jobs_count} jobs**")
     st.divider()
     
     if len(filtered_df) == 0:
         st.info("No jobs found matching your filters.")
     else:
-        # Prepare display dataframe with proper date sorting
-        display_df = filtered_df.copy()
-        
-        # Format dates for display
-        display_df['creation_date_display'] = display_df['creation_date'].apply(format_date)
-        display_df['last_updated_display'] = display_df['last_updated'].apply(format_date)
-        
-        # Create display dataframe
+        # Create display dataframe; real datetime columns give correct
+        # header-click sorting without shipping hidden sort columns
         table_df = pd.DataFrame({
-            'Job Name': display_df['job_name'],
-            'Job Link': display_df['original_url'],
-            'Creator': display_df['job_creator'],
-            'Type': display_df['job_type_edited'],
-            'Max Players': display_df['max_players'].astype(str),
-            'Verification': display_df['verification_type'],
-            'Created': display_df['creation_date_display'],
-            'Updated': display_df['last_updated_display'],
-            'GTALens': display_df['gta_lens_link'],
-            # Hidden columns for sorting
-            'creation_sort': display_df['creation_date_dt'],
-            'updated_sort': display_df['last_updated_dt'],
-            'type_order': display_df['job_type_order']
+            'Job Name': filtered_df['job_name'],
+            'Job Link': filtered_df['original_url'],
+            'Creator': filtered_df['job_creator'],
+            'Type': filtered_df['job_type_edited'],
+            'Max Players': filtered_df['max_players'].astype(str),
+            'Verification': filtered_df['verification_type'],
+            'Created': filtered_df['creation_date_dt'],
+            'Updated': filtered_df['last_updated_dt'],
+            'GTALens': filtered_df['gta_lens_link']
         })
-        
+
         st.dataframe(
             table_df,
             use_container_width=True,
@@ -570,17 +367,15 @@ with tab2:
                 "Type": st.column_config.TextColumn("Type", width="small"),
                 "Max Players": st.column_config.TextColumn("Max Players", width="small"),
                 "Verification": st.column_config.TextColumn("Verification", width="medium"),
-                "Created": st.column_config.TextColumn("Created", width="small"),
-                "Updated": st.column_config.TextColumn("Updated", width="small"),
-                "GTALens": st.column_config.LinkColumn("GTALens", display_text="GTALens Link"),
-                "creation_sort": None,
-                "updated_sort": None,
-                "type_order": None
+                "Created": st.column_config.DatetimeColumn("Created", format="MMM DD, YYYY", width="small"),
+                "Updated": st.column_config.DatetimeColumn("Updated", format="MMM DD, YYYY", width="small"),
+                "GTALens": st.column_config.LinkColumn("GTALens", display_text="GTALens Link")
             }
         )
 
-# Random Jobs
-with tab3:
+# Random Jobs. Also a fragment: generating a selection reruns only this grid
+@st.fragment
+def render_random_view(filtered_df):
     st.subheader("🎲 Random Job Selection")
     st.markdown(f"*Selecting from {len(filtered_df)} filtered jobs*")
     
@@ -596,54 +391,75 @@ with tab3:
         )
         
         if st.button("🔀 Generate Random Selection", type="primary"):
-            st.session_state.random_jobs = filtered_df.sample(n=min(random_count, len(filtered_df)))
+            # Draw k positions and take them in one iloc; cheaper than
+            # DataFrame.sample for small k
+            rng = np.random.default_rng()
+            picks = rng.choice(len(filtered_df), size=min(random_count, len(filtered_df)), replace=False)
+            st.session_state.random_jobs = filtered_df.take(picks)
         
         st.divider()
         
         if 'random_jobs' in st.session_state and len(st.session_state.random_jobs) > 0:
             st.markdown(f"### Random Selection ({len(st.session_state.random_jobs)} jobs)")
             
-            for _, job in st.session_state.random_jobs.iterrows():
+            random_df = st.session_state.random_jobs
+            # Vectorized null checks, as in the card view
+            has_image = random_df['job_image'].notna().to_numpy()
+            has_lens = random_df['gta_lens_link'].notna().to_numpy()
+            full_lobby = random_df['max_players_int'].eq(30).fillna(False).to_numpy()
+
+            # itertuples, as in the card view: namedtuples instead of a
+            # Series per row
+            for i, job in enumerate(random_df.itertuples(index=False)):
                 col1, col2 = st.columns([1, 4])
-                
+
                 with col1:
-                    if pd.notna(job['job_image']):
+                    if job.job_thumb is not None:
+                        image = job.job_thumb
+                    elif has_image[i]:
+                        image = fetch_image(job.job_image)
+                    else:
+                        image = None
+                    if image is not None:
                         try:
-                            st.image(job['job_image'], width='stretch')
+                            st.image(image, width='stretch')
                         except:
                             st.write("🖼️")
-                
+
                 with col2:
-                    max_players_text = f" ({job['max_players']} players)" if str(job['max_players']) != "30" else ""
-                    st.markdown(f"### [{job['job_name']}]({job['original_url']}) by {job['job_creator']}{max_players_text}")
-                    st.markdown(f"*Created: {format_date(job['creation_date'])}*")
-                    
+                    max_players_text = "" if full_lobby[i] else f" ({job.max_players} players)"
+                    st.markdown(f"### [{job.job_name}]({job.original_url}) by {job.job_creator}{max_players_text}")
+                    st.markdown(f"*Created: {job.creation_date_display}*")
+
                     # Badges with multiple verification types
-                    verification_badges = create_verification_badges(job['verification_type'])
+                    verification_badges = create_verification_badges(job.verification_type)
                     badge_html = f"""
                     <div style="margin: 0.5rem 0;">
-                        <span class="badge badge-blue">{job['job_type_edited']}</span>
+                        <span class="badge badge-blue">{job.job_type_edited}</span>
                         {verification_badges}
                     </div>
                     """
                     st.markdown(badge_html, unsafe_allow_html=True)
-                    
-                    if pd.notna(job['gta_lens_link']):
-                        st.markdown(f"🔗 [GTALens Link]({job['gta_lens_link']})")
-                    
-                    if pd.notna(job['job_description']) and job['job_description']:
+
+                    if has_lens[i]:
+                        st.markdown(f"🔗 [GTALens Link]({job.gta_lens_link})")
+
+                    if job.has_description:
                         with st.expander("📄 Description"):
-                            st.write(job['job_description'])
-                
+                            st.write(get_description(job.id))
+
                 st.divider()
         else:
             st.info("Click the button above to generate a random selection of jobs!")
 
+with tab3:
+    render_random_view(filtered_df)
+
 # Footer
 st.divider()
 st.markdown(
     "<div style='text-align: center; color: #6b7280; padding: 2rem;'>"
-    f"Total Jobs in Database: {len(df)}"
+    f"Total Jobs in Database: {total_jobs_count}"
     "</div>",
     unsafe_allow_html=True
 )
\ No newline at end of file
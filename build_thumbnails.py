@@ -0,0 +1,67 @@
+"""One-time ingest step: download job images and store small JPEG thumbnails.
+
+The card view shows images in a narrow column, so serving the full-size
+Rockstar UGC images wastes bandwidth on every page render. This script
+downloads each job_image once, downscales it to at most 128px and stores
+the JPEG bytes in a job_thumb BLOB column that the app prefers over the
+remote URL. Safe to re-run; only rows without a thumbnail are fetched.
+
+Requires requests and Pillow (Pillow is not needed by the app itself):
+    pip install requests Pillow
+    python build_thumbnails.py
+"""
+import io
+import sqlite3
+
+import requests
+from PIL import Image
+
+DB_PATH = 'rockstar_jobs.db'
+THUMB_MAX_SIZE = (128, 128)
+JPEG_QUALITY = 70
+FETCH_TIMEOUT = 10
+
+
+def ensure_thumb_column(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+    if 'job_thumb' not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN job_thumb BLOB")
+        conn.commit()
+
+
+def make_thumbnail(image_bytes):
+    image = Image.open(io.BytesIO(image_bytes))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image.thumbnail(THUMB_MAX_SIZE)
+    out = io.BytesIO()
+    image.save(out, format='JPEG', quality=JPEG_QUALITY)
+    return out.getvalue()
+
+
+def build_thumbnails(conn):
+    rows = conn.execute("""
+        SELECT id, job_image FROM jobs
+        WHERE job_thumb IS NULL AND job_image IS NOT NULL
+    """).fetchall()
+    print(f"{len(rows)} thumbnails to build")
+    done = failed = 0
+    for job_id, url in rows:
+        try:
+            response = requests.get(url, timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+            thumb = make_thumbnail(response.content)
+        except Exception as exc:
+            print(f"  id={job_id}: {exc}")
+            failed += 1
+            continue
+        conn.execute("UPDATE jobs SET job_thumb = ? WHERE id = ?", (thumb, job_id))
+        conn.commit()
+        done += 1
+    print(f"Done: {done} built, {failed} failed")
+
+
+if __name__ == '__main__':
+    conn = sqlite3.connect(DB_PATH)
+    ensure_thumb_column(conn)
+    build_thumbnails(conn)
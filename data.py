@@ -0,0 +1,361 @@
+"""Data access layer for the jobs database.
+
+Owns the cached SQLite connection (with its PRAGMA tuning and startup
+migrations) and every query the app runs: filtered/sorted/paginated job
+loads, match counts, filter option bounds, lazy description fetches and
+the cached remote-image fallback. app.py imports from here and only does
+widgets and rendering, so any future entry point shares one connection
+and one set of caches per process.
+"""
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import requests
+import streamlit as st
+
+# Custom job type order
+JOB_TYPE_ORDER = [
+    "GP and Street", "Race", "Stunt Race", "Banger Race", "Off Road",
+    "Deathmatch", "King of the Hill", "Last Team Standing", "Parkour", "Other"
+]
+
+# Max-player filter buckets: label shown in the sidebar -> inclusive range
+PLAYER_BUCKETS = {
+    "30": (30, 30),
+    "16-29": (16, 29),
+    "8-15": (8, 15)
+}
+
+# SQL expressions backing each sort key, so ORDER BY happens server-side.
+# Job types sort by their position in the custom order
+JOB_TYPE_ORDER_SQL = "CASE job_type_edited " + " ".join(
+    f"WHEN '{jt}' THEN {idx}" for idx, jt in enumerate(JOB_TYPE_ORDER)
+) + " ELSE 999 END"
+SQL_SORT_EXPRS = {
+    'job_name': "job_name COLLATE NOCASE",
+    'job_creator': "job_creator COLLATE NOCASE",
+    'job_type_edited': JOB_TYPE_ORDER_SQL,
+    'creation_date_dt': "creation_date_iso",
+    'last_updated_dt': "last_updated_iso",
+    'scraped_at_dt': "scraped_at"
+}
+
+# One-time index setup so the filter queries below stay fast as the table grows
+def ensure_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_job_type ON jobs(job_type_edited)")
+    conn.execute("DROP INDEX IF EXISTS idx_creation")
+    conn.execute("DROP INDEX IF EXISTS idx_update")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_creation_iso ON jobs(creation_date_iso)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_update_iso ON jobs(last_updated_iso)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_max_players ON jobs(max_players)")
+    conn.execute("ANALYZE")
+    conn.commit()
+
+# One-time migration: store the "August 08, 2015" strings as ISO dates so
+# queries get typed values without reparsing month names on every cold start.
+# Idempotent; rows scraped after the last run are converted on startup
+def ensure_iso_dates(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+    for iso_col, src_col in (('creation_date_iso', 'creation_date'),
+                             ('last_updated_iso', 'last_updated')):
+        if iso_col not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {iso_col} TEXT")
+        rows = conn.execute(
+            f"SELECT id, {src_col} FROM jobs WHERE {iso_col} IS NULL AND {src_col} IS NOT NULL"
+        ).fetchall()
+        updates = []
+        for job_id, raw in rows:
+            try:
+                iso = datetime.strptime(raw, "%B %d, %Y").strftime("%Y-%m-%d")
+            except (TypeError, ValueError):
+                continue
+            updates.append((iso, job_id))
+        conn.executemany(f"UPDATE jobs SET {iso_col} = ? WHERE id = ?", updates)
+    conn.commit()
+
+# Full-text index over the searchable columns. Contentless-delta table backed
+# by jobs; rebuilt whenever the row count drifts (i.e. after a scrape). Falls
+# back silently when this SQLite build lacks the FTS5 extension
+def ensure_fts(conn):
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                job_name, job_creator, job_description,
+                content='jobs', content_rowid='id'
+            )
+        """)
+    except sqlite3.OperationalError:
+        return
+    # count(*) on a content-backed FTS table reads the content table, so track
+    # the last indexed row count in user_version to detect staleness instead
+    indexed_rows = conn.execute("PRAGMA user_version").fetchone()[0]
+    job_rows = conn.execute("SELECT count(*) FROM jobs").fetchone()[0]
+    if indexed_rows != job_rows:
+        conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')")
+        conn.execute(f"PRAGMA user_version = {job_rows}")
+    # Sync triggers keep the index current when the scraper writes rows,
+    # so the rebuild above is only a backstop. Scoped to the indexed
+    # columns so our own migrations don't churn the index
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, job_name, job_creator, job_description)
+            VALUES (new.id, new.job_name, new.job_creator, new.job_description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, job_name, job_creator, job_description)
+            VALUES ('delete', old.id, old.job_name, old.job_creator, old.job_description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_au
+        AFTER UPDATE OF job_name, job_creator, job_description ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, job_name, job_creator, job_description)
+            VALUES ('delete', old.id, old.job_name, old.job_creator, old.job_description);
+            INSERT INTO jobs_fts(rowid, job_name, job_creator, job_description)
+            VALUES (new.id, new.job_name, new.job_creator, new.job_description);
+        END
+    """)
+    conn.commit()
+
+def fts_available(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='jobs_fts'"
+    ).fetchone() is not None
+
+# One-time migration: year columns generated from the ISO dates. ALTER TABLE
+# can only add VIRTUAL generated columns, but indexing them materializes the
+# values in the index btree, which is what the year filters scan
+def ensure_year_columns(conn):
+    # table_xinfo, not table_info: the latter hides generated columns
+    columns = [row[1] for row in conn.execute("PRAGMA table_xinfo(jobs)")]
+    if 'creation_year' not in columns:
+        conn.execute("""
+            ALTER TABLE jobs ADD COLUMN creation_year INTEGER
+            GENERATED ALWAYS AS (CAST(strftime('%Y', creation_date_iso) AS INTEGER)) VIRTUAL
+        """)
+    if 'update_year' not in columns:
+        conn.execute("""
+            ALTER TABLE jobs ADD COLUMN update_year INTEGER
+            GENERATED ALWAYS AS (CAST(strftime('%Y', last_updated_iso) AS INTEGER)) VIRTUAL
+        """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_creation_year ON jobs(creation_year)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_update_year ON jobs(update_year)")
+    conn.commit()
+
+# Thumbnails are produced offline by build_thumbnails.py; make sure the
+# column exists so queries work before that script has ever run
+def ensure_thumb_column(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+    if 'job_thumb' not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN job_thumb BLOB")
+        conn.commit()
+
+# One-time migration: a prebuilt lowercase haystack so search is a single
+# LIKE scan instead of three lower()+LIKE passes over name/creator/description
+def ensure_search_blob(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+    if 'search_blob' not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN search_blob TEXT")
+    conn.execute("""
+        UPDATE jobs SET search_blob =
+            lower(coalesce(job_name, '') || char(31) ||
+                  coalesce(job_creator, '') || char(31) ||
+                  coalesce(job_description, ''))
+        WHERE search_blob IS NULL
+    """)
+    conn.commit()
+
+# Database connection with PRAGMA tuning for Streamlit's read-heavy rerun pattern:
+# WAL lets concurrent session reads proceed without serializing, NORMAL sync is
+# safe under WAL, and the larger cache/mmap keep hot pages out of the page cache churn
+@st.cache_resource
+def get_connection():
+    conn = sqlite3.connect('rockstar_jobs.db', check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=60000")
+    ensure_iso_dates(conn)
+    ensure_year_columns(conn)
+    ensure_indexes(conn)
+    ensure_search_blob(conn)
+    ensure_thumb_column(conn)
+    ensure_fts(conn)
+    conn.execute("PRAGMA optimize")
+    return conn
+
+# Build the WHERE clause for the active filters, shared by the row and
+# count queries so both always agree
+def build_filter_sql(conn, search_term, job_types, max_players, verifications,
+                     creation_years, update_years):
+    clauses = []
+    params = []
+    if job_types:
+        placeholders = ', '.join('?' * len(job_types))
+        clauses.append(f"job_type_edited IN ({placeholders})")
+        params.extend(job_types)
+    if max_players:
+        bucket_clauses = []
+        for bucket in max_players:
+            if bucket in PLAYER_BUCKETS:
+                bucket_clauses.append("CAST(max_players AS INTEGER) BETWEEN ? AND ?")
+                params.extend(PLAYER_BUCKETS[bucket])
+        if bucket_clauses:
+            clauses.append("(" + " OR ".join(bucket_clauses) + ")")
+    if verifications:
+        # Exact token match within the comma-separated list, with the
+        # space after each comma normalized away
+        verif_clauses = []
+        for verif_type in verifications:
+            verif_clauses.append("(',' || REPLACE(verification_type, ', ', ',') || ',') LIKE ?")
+            params.append(f"%,{verif_type},%")
+        clauses.append("(" + " OR ".join(verif_clauses) + ")")
+    if creation_years:
+        clauses.append("creation_year BETWEEN ? AND ?")
+        params.extend(creation_years)
+    if update_years:
+        clauses.append("update_year BETWEEN ? AND ?")
+        params.extend(update_years)
+    if search_term:
+        if fts_available(conn):
+            # Quoted prefix query: inverted-index token lookup instead of a scan
+            clauses.append("id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+            params.append('"' + search_term.replace('"', '""') + '"*')
+        else:
+            # Literal substring match: escape LIKE wildcards in the term
+            escaped = search_term.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("search_blob LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+    where_sql = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where_sql, params
+
+# Load jobs with the active filters (and optionally sort and pagination)
+# applied server-side in SQL, cached per combination so reruns are free.
+# cache_resource hands every session the same frame without the
+# pickle/unpickle round-trip cache_data does per hit, so callers must
+# treat the result as read-only (all current consumers only slice it).
+# The filter/sort/page key space is combinatorial, so bound the entry
+# count as well as the TTL
+@st.cache_resource(ttl=300, max_entries=64)
+def load_jobs(search_term="", job_types=(), max_players=(), verifications=(),
+              creation_years=None, update_years=None,
+              sort_key=None, ascending=True, limit=None, offset=0):
+    conn = get_connection()
+    where_sql, params = build_filter_sql(conn, search_term, job_types, max_players,
+                                         verifications, creation_years, update_years)
+    query = """
+    SELECT
+        id,
+        job_name,
+        job_creator,
+        job_type_edited,
+        max_players,
+        verification_type,
+        creation_date,
+        last_updated,
+        creation_date_iso AS creation_date_dt,
+        last_updated_iso AS last_updated_dt,
+        scraped_at AS scraped_at_dt,
+        gta_lens_link,
+        original_url,
+        job_description IS NOT NULL AND job_description != '' AS has_description,
+        job_image,
+        job_thumb
+    FROM jobs
+    """
+    query += where_sql
+    if sort_key is not None:
+        sort_expr = SQL_SORT_EXPRS[sort_key]
+        direction = "ASC" if ascending else "DESC"
+        query += f" ORDER BY ({sort_expr} IS NULL), {sort_expr} {direction}"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+    # The ISO columns materialized at ingest come back typed via parse_dates,
+    # so no month-name reparsing happens here
+    df = pd.read_sql_query(query, conn, params=params,
+                           parse_dates=['creation_date_dt', 'last_updated_dt', 'scraped_at_dt'])
+    df['max_players_int'] = pd.to_numeric(df['max_players'], errors='coerce').astype('Int16')
+    # Display string formatted once here instead of per card per rerun,
+    # falling back to the raw value for unparseable dates
+    df['creation_date_display'] = df['creation_date_dt'].dt.strftime('%b %d, %Y').fillna(df['creation_date'])
+    # Tiny value domains: categorical codes are far cheaper than Python strings
+    # for memory and for the comparisons/sorts done on every rerun. Job types
+    # use an ordered categorical so sort_values honors the custom order directly
+    extra_types = sorted(set(df['job_type_edited'].dropna()) - set(JOB_TYPE_ORDER))
+    job_type_dtype = pd.CategoricalDtype(categories=JOB_TYPE_ORDER + extra_types, ordered=True)
+    df['job_type_edited'] = df['job_type_edited'].astype(job_type_dtype)
+    df['verification_type'] = df['verification_type'].astype('category')
+    return df
+
+# Descriptions are the largest per-row payload and only needed once a
+# card is expanded, so they stay out of load_jobs and are fetched here
+# one row at a time
+@st.cache_data(ttl=300, max_entries=512)
+def get_description(job_id):
+    conn = get_connection()
+    row = conn.execute("SELECT job_description FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return row[0] if row else None
+
+# Matching row count with the same WHERE clause; powers the paginator
+# without materializing any rows
+@st.cache_data(ttl=300, max_entries=256)
+def count_jobs(search_term="", job_types=(), max_players=(), verifications=(),
+               creation_years=None, update_years=None):
+    conn = get_connection()
+    where_sql, params = build_filter_sql(conn, search_term, job_types, max_players,
+                                         verifications, creation_years, update_years)
+    return conn.execute(f"SELECT COUNT(*) FROM jobs{where_sql}", params).fetchone()[0]
+
+# Filter options and slider bounds come from the full table via SQL,
+# independent of whatever filters are currently active
+@st.cache_data(ttl=300)
+def load_filter_options():
+    conn = get_connection()
+    # MIN/MAX on the bare indexed columns are O(1) btree endpoint lookups;
+    # the year is just the first four chars of the ISO string
+    row = conn.execute("""
+        SELECT
+            MIN(creation_date_iso),
+            MAX(creation_date_iso),
+            MIN(last_updated_iso),
+            MAX(last_updated_iso),
+            COUNT(*)
+        FROM jobs
+    """).fetchone()
+    job_types = [r[0] for r in conn.execute(
+        "SELECT DISTINCT job_type_edited FROM jobs WHERE job_type_edited IS NOT NULL"
+    ).fetchall()]
+    verification_types = set()
+    for (verif,) in conn.execute(
+        "SELECT DISTINCT verification_type FROM jobs WHERE verification_type IS NOT NULL"
+    ).fetchall():
+        verification_types.update(v.strip() for v in str(verif).split(','))
+    return {
+        'job_types': job_types,
+        'verification_types': sorted(verification_types),
+        'min_creation_year': int(row[0][:4]) if row[0] else 2013,
+        'max_creation_year': int(row[1][:4]) if row[1] else 2025,
+        'min_update_year': int(row[2][:4]) if row[2] else 2013,
+        'max_update_year': int(row[3][:4]) if row[3] else 2025,
+        'total_jobs': int(row[4]),
+    }
+
+# Fetch a remote job image once per day instead of letting Streamlit
+# refetch the URL on every render; only used for rows without a prebuilt
+# job_thumb. Cache failures too (as None) so a dead URL isn't retried on
+# every rerun within the TTL.
+@st.cache_data(ttl=86400, max_entries=2000, show_spinner=False)
+def fetch_image(url):
+    try:
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        return response.content
+    except requests.RequestException:
+        return None
+